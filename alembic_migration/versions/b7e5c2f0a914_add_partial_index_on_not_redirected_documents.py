@@ -0,0 +1,29 @@
+"""Add partial index on not redirected documents
+
+Revision ID: b7e5c2f0a914
+Revises: 626354ffcda0
+Create Date: 2026-10-15 10:12:31.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b7e5c2f0a914'
+down_revision = '626354ffcda0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_guidebook_documents_document_id_not_redirected',
+                    'documents', ['document_id'],
+                    unique=False,
+                    postgresql_where=sa.text('redirects_to IS NULL'),
+                    schema='guidebook')
+
+
+def downgrade():
+    op.drop_index('ix_guidebook_documents_document_id_not_redirected',
+                  table_name='documents',
+                  schema='guidebook')
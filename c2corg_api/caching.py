@@ -33,6 +33,8 @@ cache_document_version = create_region('version')
 cache_document_info = create_region('info')
 cache_sitemap = create_region('sitemap')
 cache_sitemap_xml = create_region('sitemap_xml')
+cache_search_results = create_region('search')
+cache_feed_filter = create_region('feed_filter')
 
 caches = [
     cache_document_cooked,
@@ -42,7 +44,9 @@ caches = [
     cache_document_version,
     cache_document_info,
     cache_sitemap,
-    cache_sitemap_xml
+    cache_sitemap_xml,
+    cache_search_results,
+    cache_feed_filter
 ]
 
 
@@ -74,15 +78,32 @@ def configure_caches(settings):
         timeout=float(settings['redis.pool_timeout'])
     )
 
+    redis_expiration_time = int(settings['redis.expiration_time'])
+    redis_expiration_time_search = int(
+        settings['redis.expiration_time_search'])
+    # regions whose values are only useful for a short time get their own TTL
+    redis_expiration_times = {
+        cache_search_results: redis_expiration_time_search,
+        cache_feed_filter: int(settings['redis.expiration_time_feed_filter'])
+    }
+    # the search results are considered as stale by dogpile after half of
+    # their TTL, so that they are regenerated while the old value is still
+    # available in Redis (and can be returned meanwhile)
+    expiration_times = {
+        cache_search_results: redis_expiration_time_search // 2
+    }
+
     for cache in caches:
         cache.configure(
             'dogpile.cache.redis',
+            expiration_time=expiration_times.get(cache),
             arguments={
                 'connection_pool': redis_pool,
                 "thread_local_lock": False,
                 'distributed_lock': True,
                 'lock_timeout': 15,  # 15 seconds (dogpile lock)
-                'redis_expiration_time': int(settings['redis.expiration_time'])
+                'redis_expiration_time': redis_expiration_times.get(
+                    cache, redis_expiration_time)
             },
             replace_existing_backend=True
         )
@@ -120,7 +141,8 @@ def get_or_create(cache, key, creator):
         return creator()
 
 
-def get_or_create_multi(cache, keys, creator, should_cache_fn=None):
+def get_or_create_multi(cache, keys, creator, should_cache_fn=None,
+                        expiration_time=-1):
     """ Try to get the values for the given keys from the cache. In case of
     errors fallback to the creator function (e.g. load from the database).
     """
@@ -130,7 +152,7 @@ def get_or_create_multi(cache, keys, creator, should_cache_fn=None):
 
     try:
         values = cache.get_or_create_multi(
-            keys, creator_wrapper(creator), expiration_time=-1,
+            keys, creator_wrapper(creator), expiration_time=expiration_time,
             should_cache_fn=should_cache_fn)
         cache_status.request_success()
         return values
@@ -176,6 +198,22 @@ def set(cache, key, value):
         cache_status.request_failure()
 
 
+def delete(cache, key):
+    """ Try to delete the value with the given key from the cache. In case of
+    errors, log the error and continue.
+    """
+    if cache_status.is_down():
+        log.warning('Not deleting value in cache because it seems to be down')
+        return
+
+    try:
+        cache.delete(key)
+        cache_status.request_success()
+    except Exception:
+        log.error('Deleting value in cache failed', exc_info=True)
+        cache_status.request_failure()
+
+
 class CreatorException(Exception):
     """ An exception happening during the execution of a cache `creator`
     function.
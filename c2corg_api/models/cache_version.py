@@ -178,19 +178,36 @@ def get_cache_key(document_id, lang, document_type,
         custom_cache_key)
 
 
-def get_cache_keys(document_ids, lang, document_type):
-    """ Get a cache key for all given document ids.
+def get_cache_versions(document_ids):
+    """ Get the cache versions of the given (not merged) documents as dict
+    `{document_id: version}`.
     """
     if not document_ids:
-        return []
+        return {}
 
-    versions = DBSession.query(CacheVersion). \
+    versions = DBSession. \
+        query(CacheVersion.document_id, CacheVersion.version). \
         filter(CacheVersion.document_id.in_(document_ids)). \
         join(Document,
              Document.document_id == CacheVersion.document_id). \
         filter(Document.redirects_to.is_(None)). \
         all()
-    version_for_documents = {v.document_id: v.version for v in versions}
+    return {document_id: version for document_id, version in versions}
+
+
+def get_cache_keys(document_ids, lang, document_type,
+                   version_for_documents=None):
+    """ Get a cache key for all given document ids.
+
+    `version_for_documents` can be used to pass in the cache versions
+    obtained with `get_cache_versions`, e.g. when loading the documents for
+    several document types at once.
+    """
+    if not document_ids:
+        return []
+
+    if version_for_documents is None:
+        version_for_documents = get_cache_versions(document_ids)
 
     return [
         _format_cache_key(
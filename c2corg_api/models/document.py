@@ -24,7 +24,7 @@ from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import relationship, column_property
-from sqlalchemy.sql.schema import UniqueConstraint
+from sqlalchemy.sql.schema import UniqueConstraint, Index
 
 UpdateType = enum.Enum(
     'UpdateType', 'FIGURES LANG GEOM')
@@ -186,6 +186,13 @@ class Document(Base, _DocumentMixin):
             None)
 
 
+# partial index on the documents that are not merged, used when loading
+# documents with `document_id IN (...) AND redirects_to IS NULL`
+Index('ix_guidebook_documents_document_id_not_redirected',
+      Document.document_id,
+      postgresql_where=Document.redirects_to.is_(None))
+
+
 class ArchiveDocument(Base, _DocumentMixin):
     """
     The base class for the archive documents.
@@ -17,7 +17,7 @@ from c2corg_api.models.utils import ArrayOfEnum
 from c2corg_api.views.validation import association_keys
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.dialects.postgresql.array import ARRAY
-from sqlalchemy.orm import relationship, column_property
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql.elements import literal_column
 from sqlalchemy.sql.expression import select, text, cast
 from sqlalchemy.sql.functions import func
@@ -55,12 +55,6 @@ class FilterArea(Base):
     )
 
 
-User.has_area_filter = column_property(
-    select([func.count(FilterArea.area_id) > 0]).
-    where(FilterArea.user_id == User.id).
-    correlate_except(FilterArea),
-    deferred=True
-)
 User.feed_filter_areas = relationship('Area', secondary=FilterArea.__table__)
 
 
@@ -95,14 +89,6 @@ class FollowedUser(Base):
     )
 
 
-User.is_following_users = column_property(
-    select([func.count(FollowedUser.followed_user_id) > 0]).
-    where(FollowedUser.follower_user_id == User.id).
-    correlate_except(FollowedUser),
-    deferred=True
-)
-
-
 class DocumentChange(Base):
     """This table contains "changes" that are shown in the homepage feed and
     the user profile.
@@ -9,6 +9,7 @@ from sqlalchemy import engine_from_config
 from sqlalchemy.sql.expression import and_, or_, any_
 from sqlalchemy.sql.functions import func
 
+from c2corg_api.caching import configure_caches
 from c2corg_api.models import DBSession
 from c2corg_api.models.area_association import AreaAssociation
 from c2corg_api.models.association import AssociationLog
@@ -26,9 +27,11 @@ from c2corg_api.models.user_profile import UserProfile, \
     ArchiveUserProfile, USERPROFILE_TYPE
 from c2corg_api.search import get_queue_config
 from c2corg_api.search.notify_sync import notify_es_syncer
+from c2corg_api.views.document_associations import get_first_column
 from c2corg_api.views.document_delete import remove_whole_document, \
     remove_from_cache, update_deleted_documents_list
 from c2corg_api.views.document_merge import transfer_associations, _and_in
+from c2corg_api.views.feed import invalidate_feed_filter_ids
 
 
 def usage(argv):
@@ -69,6 +72,9 @@ def main(argv=sys.argv):
 
     queue_config = get_queue_config(settings)
 
+    # the cache is needed to remove the cached feed filters of the followers
+    configure_caches(settings)
+
     logging.basicConfig()
     logging.getLogger('sqlalchemy.engine').setLevel(logging.WARN)
 
@@ -234,6 +240,15 @@ def _update_feed_entries(source_user_id, target_user_id):
         })
     )
 
+    # The cached feed filters of the users following the source user
+    # contain the id of the source user
+    follower_ids = get_first_column(
+        DBSession.query(FollowedUser.follower_user_id).
+        filter(FollowedUser.followed_user_id == source_user_id).
+        all())
+    for follower_id in follower_ids:
+        invalidate_feed_filter_ids(follower_id)
+
     # Remove subscriptions to/of the source user
     DBSession.query(FollowedUser). \
         filter(or_(
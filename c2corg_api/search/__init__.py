@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from c2corg_api.models.area import AREA_TYPE
 from c2corg_api.models.article import ARTICLE_TYPE
 from c2corg_api.models.book import BOOK_TYPE
@@ -42,10 +44,14 @@ elasticsearch_config = {
 
 
 def client_from_config(settings):
+    # the client is shared by the whole process (see
+    # `configure_es_from_config`) and keeps up to `elasticsearch.pool`
+    # keep-alive connections open. requests that time out (e.g. while a
+    # node is busy) are retried on another connection.
     return Elasticsearch([{
         'host': settings['elasticsearch.host'],
         'port': int(settings['elasticsearch.port'])
-    }], maxsize=int(settings['elasticsearch.pool']))
+    }], maxsize=int(settings['elasticsearch.pool']), retry_on_timeout=True)
 
 
 def configure_es_from_config(settings):
@@ -82,6 +88,19 @@ def create_search(document_type):
 
 
 def get_text_query_on_title(search_term, search_lang=None):
+    return MultiMatch(
+        query=search_term,
+        fuzziness='auto',
+        operator='and',
+        fields=list(_get_title_fields(search_lang))
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_title_fields(search_lang):
+    """Get the (boosted) title fields to search in for a language.
+    The field lists are cached using memoization with @lru_cache.
+    """
     fields = []
     # search in all title* (title_en, title_fr, ...) fields.
     if not search_lang:
@@ -97,12 +116,7 @@ def get_text_query_on_title(search_term, search_lang=None):
                 fields.append('title_{0}.ngram'.format(lang))
                 fields.append('title_{0}.raw^2'.format(lang))
 
-    return MultiMatch(
-        query=search_term,
-        fuzziness='auto',
-        operator='and',
-        fields=fields
-    )
+    return tuple(fields)
 
 
 search_documents = {
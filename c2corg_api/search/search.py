@@ -1,3 +1,8 @@
+import hashlib
+
+from c2corg_api import caching
+from c2corg_api.caching import cache_search_results, get_or_create_multi
+from c2corg_api.models.cache_version import get_cache_versions
 from c2corg_api.search import create_search, elasticsearch_config, \
     get_text_query_on_title
 from c2corg_api.views.document_listings import get_documents
@@ -16,10 +21,17 @@ def search_for_types(search_types, search_term, limit, lang):
         # search by document id for every type
         results_for_type = [([document_id], None)] * len(search_types)
     else:
-        # search in ElasticSearch
-        results_for_type = do_multi_search_for_types(
+        # search in ElasticSearch (or get the results from the cache)
+        results_for_type = get_results_for_types(
             search_types, search_term, limit, lang)
 
+    # get the cache versions for the documents of all types at once
+    cache_versions = get_cache_versions(list({
+        document_id
+        for (document_ids, _) in results_for_type
+        for document_id in document_ids
+    }))
+
     # load the documents using the document ids returned from the search
     results = {}
     for search_type, result_for_type in zip(search_types, results_for_type):
@@ -30,11 +42,46 @@ def search_for_types(search_types, search_term, limit, lang):
             return document_ids, total
 
         results[key] = get_documents(
-            get_documents_config, {'lang': lang}, search_documents)
+            get_documents_config, {'lang': lang}, search_documents,
+            cache_versions)
 
     return results
 
 
+def get_results_for_types(search_types, search_term, limit, lang):
+    """ Returns a list of tuples (document_ids, total) for all document types
+    like `do_multi_search_for_types`. The results are cached for a short time,
+    and ElasticSearch is only queried for the types that are not cached.
+    """
+    cache_keys = [
+        get_search_cache_key(
+            get_documents_config.document_type, search_term, limit, lang)
+        for (_, get_documents_config) in search_types
+    ]
+    search_type_for_key = dict(zip(cache_keys, search_types))
+
+    def search_for_cache_keys(*cache_keys):
+        """ This method is called from dogpile.cache with the cache keys
+        for the types that are not cached yet.
+        """
+        return do_multi_search_for_types(
+            [search_type_for_key[key] for key in cache_keys],
+            search_term, limit, lang)
+
+    # only the document ids are cached (the documents themselves are always
+    # loaded with their current version). they expire after the expiration
+    # time of the region, which is derived from `redis.expiration_time_search`
+    return get_or_create_multi(
+        cache_search_results, cache_keys, search_for_cache_keys,
+        expiration_time=None)
+
+
+def get_search_cache_key(document_type, search_term, limit, lang):
+    search_hash = hashlib.sha1('{0}|{1}|{2}|{3}'.format(
+        document_type, search_term, limit, lang).encode('utf-8')).hexdigest()
+    return '{0}-{1}'.format(search_hash, caching.CACHE_VERSION)
+
+
 def do_multi_search_for_types(search_types, search_term, limit, lang):
     """ Executes a multi-search for all document types in a single request
     and returns a list of tuples (document_ids, total) containing the results
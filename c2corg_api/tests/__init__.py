@@ -19,6 +19,8 @@ from pyramid import testing
 from alembic.config import Config
 
 import unittest
+from contextlib import contextmanager
+from sqlalchemy import event
 from webtest import TestApp
 
 from c2corg_api.emails.email_service import EmailService
@@ -306,6 +308,30 @@ def reset_queue(queue_config):
         pass
 
 
+@contextmanager
+def count_queries(connection):
+    """Count the SQL statements executed on the given connection, e.g.:
+
+        with count_queries(self.connection) as queries:
+            ...
+        self.assertLessEqual(queries.count, 5)
+    """
+    class QueryCounter(object):
+        count = 0
+
+    counter = QueryCounter()
+
+    def before_cursor_execute(*args, **kwargs):
+        counter.count += 1
+
+    event.listen(connection, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(
+            connection, 'before_cursor_execute', before_cursor_execute)
+
+
 def reset_cache_key():
     cache_version = settings['cache_version']
     caching.CACHE_VERSION = '{0}-{1}-{2}'.format(
@@ -5,7 +5,8 @@ from c2corg_api.models.area_association import AreaAssociation
 from c2corg_api.models.association import Association
 from c2corg_api.models.cache_version import CacheVersion, \
     update_cache_version, update_cache_version_associations, \
-    update_cache_version_for_area, update_cache_version_for_map
+    update_cache_version_for_area, update_cache_version_for_map, \
+    get_cache_versions
 from c2corg_api.models.outing import Outing, OUTING_TYPE
 from c2corg_api.models.route import Route, ROUTE_TYPE
 from c2corg_api.models.topo_map import TopoMap
@@ -403,3 +404,23 @@ class TestCacheVersion(BaseTestCase):
         self.assertEqual(cache_version_untouched.version, 1)
         # the cache key of the map is also not updated!
         self.assertEqual(cache_version_map.version, 1)
+
+    def test_get_cache_versions(self):
+        waypoint = Waypoint(waypoint_type='summit')
+        waypoint_merged = Waypoint(waypoint_type='summit')
+        route = Route(activities=['skitouring'])
+        self.session.add_all([waypoint, waypoint_merged, route])
+        self.session.flush()
+        waypoint_merged.redirects_to = waypoint.document_id
+        self.session.flush()
+
+        update_cache_version(route)
+
+        versions = get_cache_versions([
+            waypoint.document_id, waypoint_merged.document_id,
+            route.document_id, -1])
+        self.assertEqual(versions, {
+            waypoint.document_id: 1,
+            route.document_id: 2
+        })
+        self.assertEqual(get_cache_versions([]), {})
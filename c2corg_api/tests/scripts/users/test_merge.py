@@ -1,4 +1,5 @@
 import datetime
+from unittest.mock import patch
 
 from c2corg_api.models.area import Area
 from c2corg_api.models.area_association import AreaAssociation
@@ -8,7 +9,8 @@ from c2corg_api.models.document import Document, ArchiveDocument, \
     DocumentGeometry, ArchiveDocumentGeometry
 from c2corg_api.models.document_history import HistoryMetaData
 from c2corg_api.models.document_tag import DocumentTag, DocumentTagLog
-from c2corg_api.models.feed import DocumentChange, update_feed_document_create
+from c2corg_api.models.feed import DocumentChange, FollowedUser, \
+    update_feed_document_create
 from c2corg_api.models.mailinglist import Mailinglist
 from c2corg_api.models.outing import Outing, OutingLocale, OUTING_TYPE
 from c2corg_api.models.route import Route, RouteLocale, ROUTE_TYPE
@@ -23,6 +25,7 @@ from c2corg_api.models.waypoint import Waypoint, WaypointLocale
 from c2corg_api.scripts.users.merge import merge_user_accounts
 from c2corg_api.tests import BaseTestCase
 from c2corg_api.views.document import DocumentRest
+from c2corg_api.views.feed import get_feed_filter_ids
 
 from sqlalchemy.sql.expression import or_, any_, exists
 
@@ -124,6 +127,26 @@ class MergeUsersTest(BaseTestCase):
         self.assertEqual(1, self._count_tags(target_id))
         self.assertEqual(1, self._count_tag_logs(target_id))
 
+    @patch('c2corg_api.views.feed.run_on_successful_transaction',
+           side_effect=lambda operation: operation())
+    def test_merge_user_accounts_followers(self, run_on_successful_mock):
+        """ Test that the cached feed filter of a user following the source
+        user is removed.
+        """
+        source_id = self.global_userids['contributor']
+        target_id = self.global_userids['contributor2']
+        follower_id = self.global_userids['contributor3']
+        self.session.add(FollowedUser(
+            followed_user_id=source_id, follower_user_id=follower_id))
+        self.session.flush()
+
+        # cache the feed filter of the follower
+        self.assertEqual(([source_id], []), get_feed_filter_ids(follower_id))
+
+        merge_user_accounts(source_id, target_id, self.queue_config)
+
+        self.assertEqual(([], []), get_feed_filter_ids(follower_id))
+
     def _count_tags(self, user_id):
         return self.session.query(DocumentTag). \
             filter(DocumentTag.user_id == user_id).count()
@@ -0,0 +1,47 @@
+import json
+import unittest
+from collections import namedtuple
+from decimal import Decimal
+
+from c2corg_api import orjson_dumps
+from pyramid.renderers import JSON
+from sqlalchemy.util import KeyedTuple
+
+
+class TestJsonRenderer(unittest.TestCase):
+
+    def setUp(self):  # noqa
+        self.renderer = JSON(serializer=orjson_dumps)(None)
+
+    def _render(self, value):
+        return json.loads(self.renderer(value, {'request': None}))
+
+    def test_decimal(self):
+        self.assertEqual({'elevation': 1.5}, self._render(
+            {'elevation': Decimal('1.5')}))
+
+    def test_non_str_keys(self):
+        self.assertEqual({'1': 'a'}, self._render({1: 'a'}))
+
+    def test_json_method(self):
+        class Document(object):
+            def __json__(self, request):
+                return {'document_id': 1}
+
+        self.assertEqual([{'document_id': 1}], self._render([Document()]))
+
+    def test_named_tuple(self):
+        Point = namedtuple('Point', ['x', 'y'])
+        self.assertEqual({'x': 1, 'y': 2}, self._render(Point(1, 2)))
+
+    def test_keyed_tuple(self):
+        row = KeyedTuple([1, 'fr'], labels=['document_id', 'lang'])
+        self.assertEqual(
+            {'document_id': 1, 'lang': 'fr'}, self._render(row))
+
+    def test_use_decimal_ignored(self):
+        self.assertEqual(b'[1]', orjson_dumps([1], use_decimal=True))
+
+    def test_unserializable_value(self):
+        with self.assertRaises(TypeError):
+            self._render({'value': object()})
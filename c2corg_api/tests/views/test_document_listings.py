@@ -0,0 +1,54 @@
+import copy
+
+from c2corg_api.models import DBSession
+from c2corg_api.models.document import DocumentGeometry
+from c2corg_api.models.waypoint import Waypoint, WaypointLocale
+from c2corg_api.tests.views import BaseTestRest
+from c2corg_api.views.document_listings import _get_documents_from_ids
+from c2corg_api.views.document_schemas import waypoint_documents_config
+from sqlalchemy.exc import InvalidRequestError
+
+
+class TestDocumentListings(BaseTestRest):
+
+    def setUp(self):  # noqa
+        super(TestDocumentListings, self).setUp()
+
+        self.waypoint = Waypoint(
+            waypoint_type='summit', elevation=2000,
+            geometry=DocumentGeometry(
+                geom='SRID=3857;POINT(635956 5723604)'),
+            locales=[
+                WaypointLocale(lang='fr', title='Dent de Crolles')
+            ])
+        self.session.add(self.waypoint)
+        self.session.flush()
+
+    def test_get_documents_from_ids(self):
+        documents = _get_documents_from_ids(
+            [self.waypoint.document_id], self._get_base_query(),
+            waypoint_documents_config, 'fr')
+
+        self.assertEqual(1, len(documents))
+        self.assertEqual(
+            self.waypoint.document_id, documents[0]['document_id'])
+
+    def test_get_documents_from_ids_lazy_load_raises(self):
+        """ Test that accessing a relationship which is not eager loaded
+        raises instead of emitting a query per document.
+        """
+        def access_maps(documents, lang):
+            for document in documents:
+                document._maps
+
+        documents_config = copy.copy(waypoint_documents_config)
+        documents_config.set_custom_fields = access_maps
+
+        with self.assertRaises(InvalidRequestError):
+            _get_documents_from_ids(
+                [self.waypoint.document_id], self._get_base_query(),
+                documents_config, 'fr')
+
+    def _get_base_query(self):
+        return DBSession.query(Waypoint). \
+            filter(Waypoint.redirects_to.is_(None))
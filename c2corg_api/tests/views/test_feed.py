@@ -1,5 +1,6 @@
 import datetime
 
+from c2corg_api.caching import cache_feed_filter
 from c2corg_api.models.area import Area
 from c2corg_api.models.document import DocumentGeometry, DocumentLocale
 from c2corg_api.models.feed import DocumentChange, FilterArea, FollowedUser
@@ -8,6 +9,7 @@ from c2corg_api.models.route import Route, RouteLocale, ROUTE_TYPE
 from c2corg_api.models.user import User
 from c2corg_api.models.waypoint import Waypoint, WaypointLocale, WAYPOINT_TYPE
 from c2corg_api.tests.views import BaseTestRest
+from c2corg_api.views.feed import _get_feed_filter_cache_key
 
 
 class BaseFeedTestRest(BaseTestRest):
@@ -142,6 +144,29 @@ class TestFeedRest(BaseFeedTestRest):
             self.waypoint2.document_id,
             latest_change['document']['document_id'])
 
+    def test_get_public_feed_ignoring_other_admin(self):
+        """ Test that the id of the ignored admin user is a parameter of the
+        (cached) feed query and not part of the query itself.
+        """
+        self.app.app.registry.feed_admin_user_account_id = \
+            self.global_userids['contributor']
+        response = self.app.get(self._prefix, status=200)
+        self.assertEqual(1, len(response.json['feed']))
+
+        self.app.app.registry.feed_admin_user_account_id = \
+            self.global_userids['contributor2']
+        response = self.app.get(self._prefix + '?limit=2', status=200)
+        document_ids = get_document_ids(response.json)
+        self.assertEqual(
+            document_ids, [self.outing.document_id, self.route.document_id])
+
+        # next page with the same admin filter
+        response = self.app.get(
+            self._prefix + '?limit=2&token=' +
+            response.json['pagination_token'], status=200)
+        document_ids = get_document_ids(response.json)
+        self.assertEqual(document_ids, [self.waypoint1.document_id])
+
     def test_get_public_feed_lang(self):
         response = self.app.get(self._prefix + '?pl=en', status=200)
         body = response.json
@@ -368,6 +393,49 @@ class TestPersonalFeedRest(BaseFeedTestRest):
         self.assertEqual(
             self.waypoint2.document_id, feed[1]['document']['document_id'])
 
+    def test_get_feed_followed_user_filter_changed(self):
+        """ Get personal feed after changing the followed users (the cached
+        followed user ids have to be updated).
+        """
+        user = self.session.query(User).get(self.global_userids['contributor'])
+        user.feed_followed_only = True
+        self.session.add(FollowedUser(
+            followed_user_id=self.global_userids['contributor2'],
+            follower_user_id=self.global_userids['contributor']))
+        self.session.flush()
+
+        headers = self.add_authorization_header(username='contributor')
+        response = self.app.get('/personal-feed', status=200, headers=headers)
+        self.assertEqual(2, len(response.json['feed']))
+
+        # follow a user without changes and unfollow the other user
+        self.app_post_json(
+            '/users/follow',
+            {'user_id': self.global_userids['contributor3']},
+            headers=headers, status=200)
+        self.app_post_json(
+            '/users/unfollow',
+            {'user_id': self.global_userids['contributor2']},
+            headers=headers, status=200)
+
+        response = self.app.get('/personal-feed', status=200, headers=headers)
+        self.assertEqual(0, len(response.json['feed']))
+
+    def test_get_feed_filter_cache_ttl(self):
+        """ Test that the cached feed filter of a user expires in Redis, so
+        that a missed invalidation does not keep a stale filter forever.
+        """
+        headers = self.add_authorization_header(username='contributor')
+        self.app.get('/personal-feed', status=200, headers=headers)
+
+        cache_key = _get_feed_filter_cache_key(
+            self.global_userids['contributor'])
+        redis_client = cache_feed_filter.backend.writer_client
+        ttl = redis_client.ttl(cache_feed_filter.key_mangler(cache_key))
+        self.assertGreater(ttl, 0)
+        self.assertLessEqual(
+            ttl, int(self.settings['redis.expiration_time_feed_filter']))
+
     def test_get_feed_followed_user_and_activity_filter(self):
         """ Get personal feed with a followed user and an activity filter.
         """
@@ -1,11 +1,18 @@
+from c2corg_api.caching import cache_search_results
+from c2corg_api.models.area import Area
+from c2corg_api.models.area_association import AreaAssociation
 from c2corg_api.models.document import DocumentGeometry, DocumentLocale
 from c2corg_api.models.article import Article
 from c2corg_api.models.book import Book
 from c2corg_api.models.route import Route, RouteLocale
-from c2corg_api.models.waypoint import Waypoint, WaypointLocale
+from c2corg_api.models.waypoint import Waypoint, WaypointLocale, \
+    WAYPOINT_TYPE
 from c2corg_api.scripts.es.fill_index import fill_index
+from c2corg_api.search.search import get_search_cache_key
+from c2corg_api.tests import count_queries
 from c2corg_api.tests.search import force_search_index
 from c2corg_api.tests.views import BaseTestRest
+from dogpile.cache.api import NO_VALUE
 
 
 class TestSearchRest(BaseTestRest):
@@ -104,6 +111,93 @@ class TestSearchRest(BaseTestRest):
         # tests that user results are not included when not authenticated
         self.assertNotIn('users', body)
 
+    def test_search_query_count(self):
+        """ Test that the number of queries to load the found documents does
+        not depend on the number of documents (no lazy loading per document).
+        """
+        area = Area(
+            area_type='range',
+            locales=[DocumentLocale(lang='fr', title='Massif du Mont-Blanc')])
+        self.session.add(area)
+        waypoints = [
+            Waypoint(
+                waypoint_type='summit', elevation=elevation,
+                geometry=DocumentGeometry(
+                    geom='SRID=3857;POINT(635956 5723604)'),
+                locales=[WaypointLocale(lang='fr', title=title)])
+            for (title, elevation) in [
+                ('Aiguille Verte', 4122),
+                ('Aiguille du Midi', 3842),
+                ('Aiguille Rouge', 2545)
+            ]
+        ]
+        self.session.add_all(waypoints)
+        self.session.flush()
+        for waypoint in waypoints:
+            self.session.add(AreaAssociation(document=waypoint, area=area))
+        self.session.flush()
+        fill_index(self.session)
+        force_search_index()
+
+        # a single waypoint found
+        with count_queries(self.connection) as queries:
+            response = self.app.get(self._prefix + '?q=verte', status=200)
+        documents = response.json['waypoints']['documents']
+        self.assertIn(
+            waypoints[0].document_id,
+            [doc['document_id'] for doc in documents])
+        queries_single_document = queries.count
+
+        # several waypoints found (the first one is already cached)
+        with count_queries(self.connection) as queries:
+            response = self.app.get(self._prefix + '?q=aiguille', status=200)
+        documents = response.json['waypoints']['documents']
+        document_ids = [doc['document_id'] for doc in documents]
+        for waypoint in waypoints:
+            self.assertIn(waypoint.document_id, document_ids)
+        for doc in documents:
+            self.assertEqual(
+                [area.document_id],
+                [a['document_id'] for a in doc['areas']])
+
+        self.assertEqual(queries_single_document, queries.count)
+
+    def test_search_caching(self):
+        cache_key = get_search_cache_key(WAYPOINT_TYPE, 'crolles', 10, None)
+        self.assertEqual(cache_search_results.get(cache_key), NO_VALUE)
+
+        # check that the search results are cached
+        response = self.app.get(self._prefix + '?q=crolles', status=200)
+        waypoints = response.json['waypoints']
+        document_ids, total = cache_search_results.get(cache_key)
+        self.assertIn(self.waypoint1.document_id, document_ids)
+        self.assertEqual(total, waypoints['total'])
+
+        # check that the document ids are taken from the cache
+        cache_search_results.set(cache_key, ([], 0))
+        response = self.app.get(self._prefix + '?q=crolles', status=200)
+        waypoints = response.json['waypoints']
+        self.assertEqual(waypoints['total'], 0)
+        self.assertEqual(waypoints['documents'], [])
+
+    def test_search_caching_ttl(self):
+        """ Test that the cached search results expire in Redis after a short
+        time (and not with the TTL of the other caches).
+        """
+        cache_key = get_search_cache_key(WAYPOINT_TYPE, 'crolles', 10, None)
+        self.app.get(self._prefix + '?q=crolles', status=200)
+
+        redis_client = cache_search_results.backend.writer_client
+        ttl = redis_client.ttl(cache_search_results.key_mangler(cache_key))
+        self.assertGreater(ttl, 0)
+        self.assertLessEqual(
+            ttl, int(self.settings['redis.expiration_time_search']))
+
+        # the results are regenerated before they are removed from Redis
+        self.assertEqual(
+            int(self.settings['redis.expiration_time_search']) // 2,
+            cache_search_results.expiration_time)
+
     def test_search_by_article_title(self):
         response = self.app.get(
             self._prefix + '?q=' + str(self.article1.locales[0].title),
@@ -39,6 +39,7 @@ from pyramid.httpexceptions import HTTPNotFound, HTTPConflict, \
 from sqlalchemy.orm import joinedload, contains_eager, load_only
 from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy.orm.util import with_polymorphic
+from sqlalchemy.sql.expression import and_
 
 
 log = logging.getLogger(__name__)
@@ -272,9 +273,8 @@ class DocumentRest(object):
             self, clazz, schema, clazz_locale=None, before_update=None,
             after_update=None):
         id = self.request.validated['id']
-        document_in = \
-            schema.objectify(self.request.validated['document'])
-        self._check_document_id(id, document_in.document_id)
+        document_data = self.request.validated['document']
+        self._check_document_id(id, document_data.get('document_id'))
 
         # get the current version of the document
         document = self._get_document(clazz, id, clazz_locale=clazz_locale)
@@ -284,7 +284,10 @@ class DocumentRest(object):
         if document.protected and not self.request.has_permission('moderator'):
             raise HTTPForbidden('No permission to change a protected document')
 
-        self._check_versions(document, document_in)
+        self._check_versions(document, document_data)
+
+        # only create the input document once all checks passed
+        document_in = schema.objectify(document_data)
 
         DocumentRest.update_document(document, document_in, self.request,
                                      before_update, after_update)
@@ -313,34 +316,21 @@ class DocumentRest(object):
             locales_type_eager = locales_attr.of_type(clazz_locale) \
                 if clazz_locale else locales_attr
 
+            # the condition on the lang is part of the outer join, so that
+            # the document is also returned (with an empty `locales` list) if
+            # the requested locale is not available
             document_query = DBSession. \
                 query(clazz). \
-                join(locales_type). \
+                outerjoin(locales_type, and_(
+                    locales_type.document_id ==
+                    getattr(clazz, 'document_id'),
+                    locales_type.lang == lang)). \
                 filter(getattr(clazz, 'document_id') == id). \
-                filter(DocumentLocale.lang == lang). \
                 options(joinedload('geometry')).\
                 options(contains_eager(locales_type_eager, alias=locales_type))
             document_query = add_load_for_profiles(document_query, clazz)
             document = document_query.first()
 
-            if not document:
-                # the requested locale might not be available, try to get the
-                # document without locales
-                document_query = DBSession. \
-                    query(clazz). \
-                    filter(getattr(clazz, 'document_id') == id). \
-                    options(joinedload('geometry'))
-                document_query = add_load_for_profiles(document_query, clazz)
-                document = document_query.first()
-
-                if document:
-                    # explicitly set `locales` to an empty list so that they
-                    # are no lazy loaded
-                    document.locales = []
-                    # also detach the document from the session, so that the
-                    # empty list is not persisted
-                    DBSession.expunge(document)
-
         if not document:
             raise HTTPNotFound('document not found')
 
@@ -566,24 +556,27 @@ class DocumentRest(object):
             raise HTTPBadRequest(
                 'id in the url does not match document_id in request body')
 
-    def _check_versions(self, document, document_in):
+    def _check_versions(self, document, document_data):
         """Check that the passed-in document, geometry and all passed-in
         locales have the same version as the current document, geometry and
         locales in the database.
+        The versions are taken from the validated (not yet objectified)
+        document data.
         If not (that is the document has changed), a `HTTPConflict` exception
         is raised.
         """
-        if document.version != document_in.version:
+        if document.version != document_data.get('version'):
             raise HTTPConflict('version of document has changed')
-        for locale_in in document_in.locales:
-            locale = document.get_locale(locale_in.lang)
+        for locale_in in document_data.get('locales') or []:
+            locale = document.get_locale(locale_in.get('lang'))
             if locale:
-                if locale.version != locale_in.version:
+                if locale.version != locale_in.get('version'):
                     raise HTTPConflict(
                         'version of locale \'%s\' has changed'
                         % locale.lang)
-        if document.geometry and document_in.geometry:
-            if document.geometry.version != document_in.geometry.version:
+        geometry_in = document_data.get('geometry')
+        if document.geometry and geometry_in:
+            if document.geometry.version != geometry_in.get('version'):
                 raise HTTPConflict('version of geometry has changed')
 
 
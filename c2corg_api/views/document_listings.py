@@ -12,20 +12,23 @@ from c2corg_api.models.user import User
 from c2corg_api.models.user_profile import UserProfile
 from c2corg_api.views import to_json_dict, set_best_locale
 from c2corg_api.caching import get_or_create_multi
-from sqlalchemy.orm import joinedload, contains_eager, subqueryload, load_only
+from sqlalchemy.orm import joinedload, contains_eager, selectinload, \
+    load_only, raiseload
 from sqlalchemy.sql.expression import and_
 from sqlalchemy.sql.functions import func
 
 
-def get_documents_for_ids(document_ids, lang, documents_config, total=None):
+def get_documents_for_ids(document_ids, lang, documents_config, total=None,
+                          cache_versions=None):
     def search_documents(_, __):
         return document_ids, total
 
     return get_documents(
-        documents_config, {'lang': lang}, search_documents)
+        documents_config, {'lang': lang}, search_documents, cache_versions)
 
 
-def get_documents(documents_config, meta_params, search_documents):
+def get_documents(documents_config, meta_params, search_documents,
+                  cache_versions=None):
     lang = meta_params['lang']
     base_query = DBSession.query(documents_config.clazz). \
         filter(getattr(documents_config.clazz, 'redirects_to').is_(None))
@@ -47,7 +50,7 @@ def get_documents(documents_config, meta_params, search_documents):
 
     document_ids, total = search_documents(base_query, base_total_query)
     cache_keys = get_cache_keys(
-        document_ids, lang, documents_config.document_type)
+        document_ids, lang, documents_config.document_type, cache_versions)
 
     def get_documents_from_cache_keys(*cache_keys):
         """ This method is called from dogpile.cache with the cache keys
@@ -100,17 +103,23 @@ def _get_documents_from_ids(
         )
 
     if documents_config.include_areas:
+        # areas and their locales are collections too, joining them would
+        # return a row for each combination of document, area and locale
         base_query = base_query. \
             options(
-                joinedload(getattr(documents_config.clazz, '_areas')).
+                selectinload(getattr(documents_config.clazz, '_areas')).
                 load_only(
                     'document_id', 'area_type', 'version', 'protected',
                     'type').
-                joinedload('locales').
+                selectinload('locales').
                 load_only(
                     'lang', 'title', 'version')
             )
 
+    # all relationships needed for the serialization are eager loaded above,
+    # make sure that no lazy loads (one query per document) are introduced
+    base_query = base_query.options(raiseload('*'))
+
     documents = _load_documents(
         document_ids, documents_config.clazz, base_query)
 
@@ -177,11 +186,13 @@ def add_profile_filter(document_query, clazz):
 
 def add_load_for_locales(
         base_query, clazz, clazz_locale, load_only_fields=None):
+    # the locales are loaded with a separate `IN` query on the ids of the
+    # loaded documents (instead of repeating the documents query as subquery)
     if clazz_locale:
-        locales_load = subqueryload(
+        locales_load = selectinload(
             getattr(clazz, 'locales').of_type(clazz_locale))
     else:
-        locales_load = subqueryload(getattr(clazz, 'locales'))
+        locales_load = selectinload(getattr(clazz, 'locales'))
 
     if load_only_fields:
         locales_load = locales_load.load_only(*load_only_fields)
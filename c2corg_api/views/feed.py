@@ -1,10 +1,15 @@
 from collections import defaultdict
 
+from c2corg_api import caching
+from c2corg_api.caching import cache_feed_filter, get_or_create
 from c2corg_api.models import DBSession
+from c2corg_api.models.cache_version import get_cache_versions
 from c2corg_api.models.feed import DocumentChange, FollowedUser, FilterArea
 from c2corg_api.models.image import IMAGE_TYPE
 from c2corg_api.models.user import User
 from c2corg_api.models.user_profile import USERPROFILE_TYPE
+from c2corg_api.search.notify_sync import run_on_successful_transaction
+from c2corg_api.views.document_associations import get_first_column
 from c2corg_api.views.document_listings import get_documents_for_ids
 from c2corg_api.views.document_schemas import document_configs
 from c2corg_api.views.validation import validate_preferred_lang_param, \
@@ -12,14 +17,18 @@ from c2corg_api.views.validation import validate_preferred_lang_param, \
 from cornice.resource import resource, view
 from c2corg_api.views import cors_policy, restricted_view
 from pyramid.httpexceptions import HTTPNotFound, HTTPForbidden
-from sqlalchemy.orm import undefer, load_only
-from sqlalchemy.sql.expression import or_, and_
-from sqlalchemy.sql.functions import func
+from sqlalchemy.dialects.postgresql.array import ARRAY
+from sqlalchemy.ext import baked
+from sqlalchemy.orm import load_only
+from sqlalchemy.sql.expression import or_, and_, cast, bindparam
+from sqlalchemy.sql.sqltypes import Integer
 from urllib import parse as urllib_parse
 
 DEFAULT_PAGE_LIMIT = 10
 MAX_PAGE_LIMIT = 50
 
+bakery = baked.bakery()
+
 
 @resource(path='/feed', cors_policy=cors_policy)
 class FeedRest(object):
@@ -55,10 +64,9 @@ class FeedRest(object):
 
         """
         lang, token_id, token_time, limit = get_params(self.request)
-        ignore_admin_changes_filter = get_ignore_admin_entries_filter(
-            self.request)
         changes = get_changes_of_feed(
-            token_id, token_time, limit, ignore_admin_changes_filter)
+            token_id, token_time, limit,
+            ignore_admin_user_id=get_ignore_admin_user_id(self.request))
         return load_feed(changes, lang)
 
 
@@ -81,10 +89,9 @@ class PersonalFeedRest(object):
         """
         user_id = self.request.authenticated_userid
         lang, token_id, token_time, limit = get_params(self.request)
-        ignore_admin_changes_filter = get_ignore_admin_entries_filter(
-            self.request)
         changes = get_changes_of_personal_feed(
-            user_id, token_id, token_time, limit, ignore_admin_changes_filter)
+            user_id, token_id, token_time, limit,
+            get_ignore_admin_user_id(self.request))
         return load_feed(changes, lang)
 
 
@@ -146,58 +153,123 @@ def get_params(request, default_page_limit=DEFAULT_PAGE_LIMIT):
     return lang, token_id, token_time, limit
 
 
-def get_changes_of_feed(token_id, token_time, limit, extra_filter=None):
-    query = DBSession. \
+def get_changes_of_feed(
+        token_id, token_time, limit, extra_filter=None,
+        ignore_admin_user_id=None):
+    paginate = token_id is not None and token_time
+    ignore_admin = ignore_admin_user_id is not None
+
+    if extra_filter is None:
+        # the query of the standard feed only differs by the pagination, the
+        # admin filter and the limit, so that a baked query is used to compile
+        # it only once
+        baked_query = bakery(_get_feed_query)
+        if paginate:
+            baked_query += _add_feed_pagination_filter
+        if ignore_admin:
+            baked_query += _add_ignore_admin_filter
+        baked_query.add_criteria(lambda q: q.limit(limit), limit)
+        query = baked_query(DBSession())
+    else:
+        # the personal filter is not baked because its shape depends on the
+        # preferences of the user (followed users only, or a combination of
+        # area/activity/lang filters with the followed users)
+        query = _get_feed_query(DBSession)
+        if paginate:
+            query = _add_feed_pagination_filter(query)
+        if ignore_admin:
+            query = _add_ignore_admin_filter(query)
+        query = query.filter(extra_filter).limit(limit)
+
+    params = {}
+    if paginate:
+        params.update(token_time=token_time, token_id=token_id)
+    if ignore_admin:
+        params.update(admin_user_id=ignore_admin_user_id)
+    if params:
+        query = query.params(**params)
+
+    return query.all()
+
+
+def _get_feed_query(session):
+    # only load the columns needed to build the feed (the `activities`,
+    # `langs` and `area_ids` arrays are only used for filtering)
+    return session. \
         query(DocumentChange). \
+        options(load_only(
+            DocumentChange.change_id, DocumentChange.time,
+            DocumentChange.user_id, DocumentChange.user_ids,
+            DocumentChange.change_type, DocumentChange.document_id,
+            DocumentChange.document_type, DocumentChange.image1_id,
+            DocumentChange.image2_id, DocumentChange.image3_id,
+            DocumentChange.more_images)). \
         order_by(DocumentChange.time.desc(), DocumentChange.change_id)
 
-    # pagination filter
-    if token_id is not None and token_time:
-        query = query.filter(
-            or_(
-                DocumentChange.time < token_time,
-                and_(
-                    DocumentChange.time == token_time,
-                    DocumentChange.change_id > token_id)))
 
-    if extra_filter is not None:
-        query = query.filter(extra_filter)
+def _add_feed_pagination_filter(query):
+    token_time = bindparam('token_time')
+    token_id = bindparam('token_id')
+    # the first condition is implied by the second one, but unlike the
+    # `or` it can be used as bound for an index range scan on the index
+    # `(time desc, change_id)`
+    return query.filter(
+        DocumentChange.time <= token_time,
+        or_(
+            DocumentChange.time < token_time,
+            and_(
+                DocumentChange.time == token_time,
+                DocumentChange.change_id > token_id)))
 
-    return query.limit(limit).all()
+
+def _add_ignore_admin_filter(query):
+    return query.filter(DocumentChange.user_id != bindparam('admin_user_id'))
 
 
 def get_changes_of_personal_feed(
-        user_id, token_id, token_time, limit, ignore_admin_changes_filter):
+        user_id, token_id, token_time, limit, ignore_admin_user_id):
     user = DBSession.query(User). \
         filter(User.id == user_id). \
-        options(undefer('has_area_filter')). \
-        options(undefer('is_following_users')). \
+        options(load_only(
+            User.id, User.feed_followed_only, User.feed_filter_activities,
+            User.feed_filter_langs)). \
         first()
+    # the ids of the followed users and of the filter areas are cached, so
+    # that no additional query is needed to check if they are set
+    followed_user_ids, filtered_area_ids = get_feed_filter_ids(user_id)
 
-    if has_no_custom_filter(user):
+    if has_no_custom_filter(user, followed_user_ids, filtered_area_ids):
         # if no custom filter is set (no area/activity filter and no followed
         # users), return the full/standard feed
         return get_changes_of_feed(
-            token_id, token_time, limit, ignore_admin_changes_filter)
+            token_id, token_time, limit,
+            ignore_admin_user_id=ignore_admin_user_id)
 
-    personal_filter = create_personal_filter(user, ignore_admin_changes_filter)
+    ignore_admin_changes_filter = \
+        DocumentChange.user_id != ignore_admin_user_id \
+        if ignore_admin_user_id is not None else None
+    personal_filter = create_personal_filter(
+        user, followed_user_ids, filtered_area_ids,
+        ignore_admin_changes_filter)
 
     return get_changes_of_feed(token_id, token_time, limit, personal_filter)
 
 
-def create_personal_filter(user, ignore_admin_changes_filter):
+def create_personal_filter(
+        user, followed_user_ids, filtered_area_ids,
+        ignore_admin_changes_filter):
     """ Create a filter condition for the query to get the changes taking
     the filter preferences of the user into account.
     """
     if user.feed_followed_only:
         # only include changes of followed users
-        return create_followed_users_filter(user)
+        return create_followed_users_filter(followed_user_ids)
 
     # filter on area, activity and langs (`and` connected)
     feed_filter = None
-    if user.feed_filter_activities or user.has_area_filter or \
+    if user.feed_filter_activities or filtered_area_ids or \
        user.feed_filter_langs:
-        area_filter = create_area_filter(user)
+        area_filter = create_area_filter(filtered_area_ids)
         activity_filter = create_activity_filter(user)
         lang_filter = create_lang_filter(user)
 
@@ -221,9 +293,7 @@ def create_personal_filter(user, ignore_admin_changes_filter):
         return None
 
     # filter on followed users
-    followed_users_filter = None
-    if user.is_following_users:
-        followed_users_filter = create_followed_users_filter(user)
+    followed_users_filter = create_followed_users_filter(followed_user_ids)
 
     # `or` connect the filter on followed users with the area/activity filter
     if feed_filter is not None and followed_users_filter is not None:
@@ -239,38 +309,67 @@ def create_personal_filter(user, ignore_admin_changes_filter):
         return ignore_admin_changes_filter
 
 
-def has_no_custom_filter(user):
+def has_no_custom_filter(user, followed_user_ids, filtered_area_ids):
     has_custom_filter = (
         user.feed_filter_activities or
         user.feed_filter_langs or
-        user.has_area_filter or
-        user.is_following_users or
+        filtered_area_ids or
+        followed_user_ids or
         user.feed_followed_only)
     return not has_custom_filter
 
 
-def create_followed_users_filter(user):
-    if not user.is_following_users:
+def create_followed_users_filter(followed_user_ids):
+    if not followed_user_ids:
         return None
 
-    followed_users = DBSession. \
-        query(func.array_agg(FollowedUser.followed_user_id)). \
-        filter(FollowedUser.follower_user_id == user.id). \
-        group_by(FollowedUser.follower_user_id). \
-        subquery('followed_users')
-    return DocumentChange.user_ids.op('&&')(followed_users)
+    return DocumentChange.user_ids.op('&&')(
+        cast(followed_user_ids, ARRAY(Integer)))
 
 
-def create_area_filter(user):
-    if not user.has_area_filter:
+def create_area_filter(filtered_area_ids):
+    if not filtered_area_ids:
         return None
 
-    filtered_area_ids = DBSession. \
-        query(func.array_agg(FilterArea.area_id)). \
-        filter(FilterArea.user_id == user.id). \
-        group_by(FilterArea.user_id). \
-        subquery('filtered_area_ids')
-    return DocumentChange.area_ids.op('&&')(filtered_area_ids)
+    return DocumentChange.area_ids.op('&&')(
+        cast(filtered_area_ids, ARRAY(Integer)))
+
+
+def get_feed_filter_ids(user_id):
+    """ Return the ids of the users followed by the given user and the ids of
+    the areas of the feed filter of the user as tuple
+    `(followed_user_ids, filtered_area_ids)`.
+
+    The ids are cached, so that they can be passed as array parameters in the
+    feed query (instead of subqueries). When the preferences of the user change, the cached value has
+    to be removed with `invalidate_feed_filter_ids`.
+    """
+    def load_ids():
+        followed_user_ids = get_first_column(
+            DBSession.query(FollowedUser.followed_user_id).
+            filter(FollowedUser.follower_user_id == user_id).
+            all())
+        filtered_area_ids = get_first_column(
+            DBSession.query(FilterArea.area_id).
+            filter(FilterArea.user_id == user_id).
+            all())
+        return followed_user_ids, filtered_area_ids
+
+    return get_or_create(
+        cache_feed_filter, _get_feed_filter_cache_key(user_id), load_ids)
+
+
+def invalidate_feed_filter_ids(user_id):
+    """ Remove the cached feed filter ids of the given user once the current
+    transaction is committed.
+    """
+    cache_key = _get_feed_filter_cache_key(user_id)
+    run_on_successful_transaction(
+        lambda: caching.delete(cache_feed_filter, cache_key))
+
+
+def _get_feed_filter_cache_key(user_id):
+    return '{0}-{1}'.format(user_id, caching.CACHE_VERSION)
 
 
 def create_activity_filter(user):
@@ -311,9 +410,10 @@ def load_feed(changes, lang):
     documents = load_documents(documents_to_load, lang)
 
     # only return changes for which the document/user could be loaded
+    get = documents.get
     changes = [
         c for c in changes
-        if documents.get(c.user_id) and documents.get(c.document_id)
+        if get(c.user_id) and get(c.document_id)
     ]
 
     if not changes:
@@ -324,28 +424,27 @@ def load_feed(changes, lang):
         last_change.change_id,
         urllib_parse.quote_plus(last_change.time.isoformat()))
 
+    # the image ids are passed to `get` without checking them first, because
+    # `get(None)` returns None if there is no image
     return {
         'feed': [
             {
                 'id': c.change_id,
                 'time': c.time.isoformat(),
-                'user': documents[c.user_id],
+                'user': get(c.user_id),
                 'participants': [
-                    documents[user_id]
-                    for user_id in c.user_ids
-                    if user_id != c.user_id and documents.get(user_id)
+                    participant
+                    for participant in (
+                        get(user_id)
+                        for user_id in c.user_ids
+                        if user_id != c.user_id)
+                    if participant
                 ],
                 'change_type': c.change_type,
-                'document': documents[c.document_id],
-                'image1':
-                    documents[c.image1_id]
-                    if c.image1_id and documents.get(c.image1_id) else None,
-                'image2':
-                    documents[c.image2_id]
-                    if c.image2_id and documents.get(c.image2_id) else None,
-                'image3':
-                    documents[c.image3_id]
-                    if c.image3_id and documents.get(c.image3_id) else None,
+                'document': get(c.document_id),
+                'image1': get(c.image1_id),
+                'image2': get(c.image2_id),
+                'image3': get(c.image3_id),
                 'more_images': c.more_images
             }
             for c in changes
@@ -373,19 +472,28 @@ def get_documents_to_load(changes):
         }
     """
     documents_to_load = defaultdict(set)
+    # bind the methods of the sets used for every change to local names
+    user_ids = documents_to_load[USERPROFILE_TYPE]
+    add_user_id = user_ids.add
+    add_user_ids = user_ids.update
+    image_ids = set()
+    add_image_id = image_ids.add
 
     for change in changes:
         documents_to_load[change.document_type].add(change.document_id)
 
-        documents_to_load[USERPROFILE_TYPE].add(change.user_id)
-        documents_to_load[USERPROFILE_TYPE].update(change.user_ids)
+        add_user_id(change.user_id)
+        add_user_ids(change.user_ids)
 
         if change.image1_id:
-            documents_to_load[IMAGE_TYPE].add(change.image1_id)
+            add_image_id(change.image1_id)
         if change.image2_id:
-            documents_to_load[IMAGE_TYPE].add(change.image2_id)
+            add_image_id(change.image2_id)
         if change.image3_id:
-            documents_to_load[IMAGE_TYPE].add(change.image3_id)
+            add_image_id(change.image3_id)
+
+    if image_ids:
+        documents_to_load[IMAGE_TYPE].update(image_ids)
 
     return documents_to_load
 
@@ -393,10 +501,17 @@ def get_documents_to_load(changes):
 def load_documents(documents_to_load, lang):
     documents = {}
 
+    # get the cache versions for the documents of all types at once
+    cache_versions = get_cache_versions(list(set().union(
+        *documents_to_load.values())))
+
     for document_type, document_ids in documents_to_load.items():
+        if not document_ids:
+            continue
         document_config = document_configs[document_type]
         docs = get_documents_for_ids(
-            document_ids, lang, document_config).get('documents')
+            document_ids, lang, document_config,
+            cache_versions=cache_versions).get('documents')
 
         for doc in docs:
             documents[doc['document_id']] = doc
@@ -404,9 +519,8 @@ def load_documents(documents_to_load, lang):
     return documents
 
 
-def get_ignore_admin_entries_filter(request):
-    account_id = request.registry.feed_admin_user_account_id
-    if account_id is None:
-        return None
-
-    return DocumentChange.user_id != account_id
+def get_ignore_admin_user_id(request):
+    """ Return the id of the admin account whose changes are not shown in the
+    feed (or None if no such account is configured).
+    """
+    return request.registry.feed_admin_user_account_id
@@ -5,6 +5,7 @@ from c2corg_api.models.feed import FollowedUser
 from c2corg_api.views import cors_policy, restricted_json_view
 from c2corg_api.views.document_listings import get_documents_for_ids
 from c2corg_api.views.document_schemas import user_profile_documents_config
+from c2corg_api.views.feed import invalidate_feed_filter_ids
 from c2corg_api.views.validation import validate_id, \
     validate_preferred_lang_param, validate_body_user_id
 from colander import MappingSchema, SchemaNode, Integer, required
@@ -57,6 +58,7 @@ class UserFollowRest(object):
             DBSession.add(FollowedUser(
                 followed_user_id=followed_user_id,
                 follower_user_id=follower_user_id))
+            invalidate_feed_filter_ids(follower_user_id)
 
         return {}
 
@@ -87,6 +89,7 @@ class UserUnfollowRest(object):
 
         if follower_relation:
             DBSession.delete(follower_relation)
+            invalidate_feed_filter_ids(follower_user_id)
         else:
             log.warning(
                 'tried to delete not existing follower relation '
@@ -4,6 +4,7 @@ from c2corg_api.models.schema_utils import SchemaAssociationDoc
 from c2corg_api.models.user import User
 from c2corg_api.views import cors_policy, restricted_json_view, \
     restricted_view, to_json_dict, set_best_locale
+from c2corg_api.views.feed import invalidate_feed_filter_ids
 from c2corg_api.views.validation import validate_preferred_lang_param
 from c2corg_api.models.common.attributes import activities, default_langs
 from cornice.resource import resource
@@ -109,5 +110,6 @@ class UserFilterPreferencesRest(object):
                 all()
 
         user.feed_filter_areas = areas
+        invalidate_feed_filter_ids(user.id)
 
         return {}